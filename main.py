@@ -8,6 +8,16 @@ from google.genai import types
 import json
 import random
 import os
+import atexit
+import httpx
+import weakref
+import io
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from PyPDF2 import PdfReader
 
 # ---- Page Config ----
 st.set_page_config(
@@ -19,6 +29,23 @@ st.set_page_config(
 
 # ---- 0. GEMINI API INITIALIZATION & TOOLS ----
 
+# HTTP connection pool shared by all sessions (keep-alive, size-bounded, idle connections evicted)
+GEMINI_POOL_LIMITS = httpx.Limits(
+    max_connections=20,
+    max_keepalive_connections=10,
+    keepalive_expiry=30.0,  # seconds before an idle connection is dropped
+)
+
+@st.cache_resource(show_spinner=False)
+def get_gemini_client(api_key):
+    """One process-wide Gemini client; Streamlit reruns and sessions all reuse it."""
+    http_client = httpx.Client(limits=GEMINI_POOL_LIMITS)
+    shared_client = genai.Client(api_key=api_key, http_options=types.HttpOptions(httpx_client=http_client))
+    # Closes the pool once the client is garbage collected (e.g. after st.cache_resource.clear())
+    # or at process exit, whichever comes first. Holds no reference to shared_client itself.
+    weakref.finalize(shared_client, http_client.close)
+    return shared_client
+
 try:
     # Key को सीधे Render Environment Variable से पढ़ें
     API_KEY = os.environ.get("GEMINI_API_KEY") 
@@ -27,7 +54,7 @@ try:
     if not API_KEY:
         raise ValueError("API Key not found in Environment.")
         
-    client = genai.Client(api_key=API_KEY)
+    client = get_gemini_client(API_KEY)
     MODEL_NAME = 'gemini-2.5-flash'
     GEMINI_ENABLED = True
 except Exception as e:
@@ -299,6 +326,103 @@ def gemini_get_preventive_tip(health_score, search_text):
     except:
         return "आपके स्वास्थ्य स्कोर के लिए एक खास टिप: आज 7-8 गिलास पानी पिएं! 💧"
 
+# 🛑 NEW: GEMINI STRUCTURED DIAGNOSIS (ONE CALL: DIAGNOSIS + SEVERITY + ADVICE + TIP AS JSON) 🛑
+# Replaces the two round trips above (gemini_search_and_diagnose + gemini_get_preventive_tip)
+# with a single request. NOTE: Gemini does not allow the google_search tool together with a
+# JSON response schema, so this mode is not search-grounded.
+GEMINI_STRUCTURED_MODE = True
+SEVERITY_LEVELS = ["Mild", "Moderate", "High", "Critical"]
+SEVERITY_EMOJI_MAP = {"Mild":"✅", "Moderate":"⚠️", "High":"🛑", "Critical":"🚨"}
+DIAGNOSIS_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "disease": {"type": "STRING"},
+        "severity": {"type": "STRING", "enum": SEVERITY_LEVELS},
+        "advice": {"type": "STRING"},
+        "preventive_tip": {"type": "STRING"},
+        "confidence": {"type": "INTEGER"},
+    },
+    "required": ["disease", "severity", "advice", "preventive_tip", "confidence"],
+    "property_ordering": ["disease", "severity", "advice", "preventive_tip", "confidence"],
+}
+
+def validate_structured_diagnosis(raw_text):
+    """Parse the JSON reply and return a dict with typed fields, or raise ValueError."""
+    try:
+        data = json.loads(raw_text)
+    except (TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid JSON from Gemini: {e}")
+    if not isinstance(data, dict):
+        raise ValueError("Gemini JSON response is not an object.")
+
+    for field in ("disease", "advice", "preventive_tip"):
+        if not isinstance(data.get(field), str) or not data[field].strip():
+            raise ValueError(f"Missing field in Gemini response: {field}")
+
+    severity = str(data.get("severity", "")).strip().capitalize()
+    if severity not in SEVERITY_LEVELS:
+        raise ValueError(f"Unknown severity in Gemini response: {data.get('severity')}")
+
+    # bool is a subclass of int - a JSON true/false is not a confidence value
+    raw_confidence = data.get("confidence")
+    if isinstance(raw_confidence, bool) or not isinstance(raw_confidence, (int, float)) or raw_confidence != raw_confidence or abs(raw_confidence) == float("inf"):
+        raise ValueError(f"Invalid confidence in Gemini response: {raw_confidence}")
+    confidence = int(round(raw_confidence))
+
+    return {
+        "disease": data["disease"].strip(),
+        "severity": severity,
+        "advice": data["advice"].strip(),
+        "preventive_tip": data["preventive_tip"].strip(),
+        "confidence": max(0, min(100, confidence)),
+    }
+
+def build_structured_diagnosis_request(health_score, search_text):
+    """Prompt + JSON config for gemini_structured_diagnose."""
+    prompt = f"""
+    आप एक विशेषज्ञ मेडिकल सलाहकार हैं।
+    उपयोगकर्ता के मुख्य लक्षण (Symptoms) हैं: "{search_text}"
+    यूजर का हेल्थ स्कोर {health_score}% है।
+
+    **CRITICAL**: सभी टेक्स्ट फ़ील्ड (disease, advice, preventive_tip) **सख्त रूप से उसी भाषा** में दें जिस भाषा में उपयोगकर्ता ने मुख्य लक्षण दिए हैं।
+
+    - disease: प्राथमिक संभावित रोग (Primary Disease) का नाम।
+    - severity: केवल इनमें से एक: Mild, Moderate, High, Critical।
+    - advice: रोग के लिए एक संक्षिप्त, विश्वसनीय सलाह (Medical Advice)।
+    - preventive_tip: स्कोर और लक्षणों के आधार पर एक एकल दैनिक निवारक टिप (15 शब्दों से अधिक नहीं)।
+    - confidence: आपके निदान का आत्मविश्वास, 0 से 100 के बीच पूर्णांक।
+    """
+
+    config = types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=DIAGNOSIS_RESPONSE_SCHEMA,
+    )
+    return prompt, config
+
+def structured_diagnosis_error(e):
+    if isinstance(e, ValueError):
+        return f"Gemini API Call Error: {e}"
+    error_message = str(e)
+    if "503 UNAVAILABLE" in error_message or "rate limit" in error_message:
+        return "Gemini API Call Error: Server is busy or rate limit exceeded. Please try again later."
+    return f"Gemini API Call Error or connection issue: {e}"
+
+def gemini_structured_diagnose(health_score, search_text):
+    """Returns a validated diagnosis dict on success, or an error string (like the other helpers)."""
+    if not GEMINI_ENABLED:
+        return "Gemini Validation: API Key कॉन्फ़िगर नहीं है।"
+
+    prompt, config = build_structured_diagnosis_request(health_score, search_text)
+    try:
+        response = client.models.generate_content(
+            model=MODEL_NAME,
+            contents=prompt,
+            config=config,
+        )
+        return validate_structured_diagnosis(response.text)
+    except Exception as e:
+        return structured_diagnosis_error(e)
+
 # 🛑 NEW FUNCTION: GEMINI MEDICATION INTERACTION CHECKER (ULTRA-FLEXIBLE MULTILINGUAL PROMPT) 🛑
 def gemini_check_interaction(med_a, med_b):
     if not GEMINI_ENABLED:
@@ -350,6 +474,200 @@ def gemini_generate_diet_plan(disease_name):
     except Exception as e:
         return f"Gemini API त्रुटि: {e}"
 
+# 🛑 NEW: LAB REPORT UPLOAD (PDF / IMAGE) -> TEXT -> advanced_semantic_diagnose 🛑
+# Budgets so a huge scanned report never gets processed (or held as text) in full.
+# Upload size itself is capped by server.maxUploadSize in .streamlit/config.toml.
+REPORT_MAX_PAGES = 30
+REPORT_MAX_TEXT_BYTES = 100_000
+REPORT_MAX_OCR_CALLS = 10  # Gemini calls for scanned (image-only) PDF pages, per report
+REPORT_IMAGE_MAX_SIDE = 1600
+REPORT_CACHE_SIZE = 32
+# Only this much of the report (matched finding lines) is shown / kept for diagnosis
+REPORT_MAX_FINDING_LINES = 20
+REPORT_MAX_FINDING_LINE_CHARS = 200
+# Lines with these markers report a negative/normal result and are not findings
+REPORT_NEGATIVE_MARKERS = ["negative", "non reactive", "nonreactive", "not seen", "not detected", "absent", "nil", "no", "normal", "सामान्य"]
+# Abnormal-result flags: the line is shown as a finding even if it maps to no symptom
+REPORT_ABNORMAL_MARKERS = ["high", "low", "abnormal", "positive", "reactive"]
+REPORT_EMERGENCY_SYMPTOMS = {"chest pain", "shortness breath"}
+
+@st.cache_resource(show_spinner=False)
+def get_report_executor():
+    # Background worker shared by all sessions, shut down on process exit
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report-extract")
+    atexit.register(executor.shutdown, wait=False, cancel_futures=True)
+    return executor
+
+@st.cache_resource(show_spinner=False)
+def get_report_text_cache():
+    # file hash -> extracted text (LRU), or (Future, progress) while that file is still being extracted
+    return {"lock": threading.Lock(), "items": OrderedDict()}
+
+def hash_uploaded_file(file_obj, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    file_obj.seek(0)
+    for chunk in iter(lambda: file_obj.read(chunk_size), b""):
+        digest.update(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+def truncate_utf8(text, max_bytes):
+    return text.encode("utf-8")[:max(0, max_bytes)].decode("utf-8", "ignore")
+
+def iter_pdf_page_texts(file_obj, max_pages=REPORT_MAX_PAGES, max_text_bytes=REPORT_MAX_TEXT_BYTES, max_ocr_calls=REPORT_MAX_OCR_CALLS):
+    """Yields (page_number, total_pages, text) one page at a time, stopping at the page/byte budget.
+    Pages without a text layer (scanned) are read from their embedded images via Gemini, at most
+    max_ocr_calls images per report; images that fail to decode or OCR are skipped."""
+    reader = PdfReader(file_obj)
+    total_pages = min(len(reader.pages), max_pages)
+    used_bytes = 0
+    ocr_calls = 0
+    for index in range(total_pages):
+        page = reader.pages[index]
+        page_text = page.extract_text() or ""
+        if not page_text.strip() and GEMINI_ENABLED and ocr_calls < max_ocr_calls:
+            image_texts = []
+            try:
+                page_images = list(page.images)
+            except Exception:
+                page_images = []
+            for page_image in page_images:
+                remaining = max_text_bytes - used_bytes - len("\n".join(image_texts).encode("utf-8"))
+                if remaining <= 0 or ocr_calls >= max_ocr_calls:
+                    break
+                try:
+                    image_bytes = downscale_report_image(io.BytesIO(page_image.data))
+                except Exception:
+                    continue  # e.g. CCITT/JBIG2 scans Pillow cannot decode
+                ocr_calls += 1
+                try:
+                    image_texts.append(gemini_extract_report_image_text(image_bytes, remaining))
+                except Exception:
+                    continue
+            page_text = "\n".join(image_texts)
+        encoded_len = len(page_text.encode("utf-8"))
+        if used_bytes + encoded_len >= max_text_bytes:
+            yield index + 1, total_pages, truncate_utf8(page_text, max_text_bytes - used_bytes)
+            return
+        used_bytes += encoded_len
+        yield index + 1, total_pages, page_text
+
+def downscale_report_image(file_obj, max_side=REPORT_IMAGE_MAX_SIDE):
+    """Returns JPEG bytes no larger than max_side on either edge."""
+    try:
+        image = Image.open(file_obj)
+        image.draft("RGB", (max_side, max_side))  # JPEG: decode at reduced size directly
+        image.thumbnail((max_side, max_side))  # shrink before any conversion (PNG etc. can't use draft)
+    except Image.DecompressionBombError:
+        raise ValueError("इमेज बहुत बड़ी है (बहुत अधिक पिक्सेल), इसे प्रोसेस नहीं किया जा सकता।")
+    image = image.convert("RGB")
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=85)
+    return output.getvalue()
+
+def gemini_extract_report_image_text(image_bytes, max_text_bytes=REPORT_MAX_TEXT_BYTES):
+    if not GEMINI_ENABLED:
+        raise RuntimeError("Gemini API अनुपलब्ध है। इमेज रिपोर्ट से टेक्स्ट नहीं निकाला जा सकता।")
+
+    prompt = """
+    यह एक मेडिकल लैब रिपोर्ट की इमेज है। इसमें लिखे सभी टेस्ट, वैल्यू, निष्कर्ष (Findings) और लक्षणों को सादे टेक्स्ट (plain text) में निकालें।
+    कोई व्याख्या न जोड़ें, केवल रिपोर्ट का टेक्स्ट दें।
+    """
+    response = client.models.generate_content(
+        model=MODEL_NAME,
+        contents=[types.Part.from_bytes(data=image_bytes, mime_type="image/jpeg"), prompt],
+    )
+    return truncate_utf8(response.text or "", max_text_bytes)
+
+def extract_report_text(file_obj, file_type, progress):
+    if file_type == "application/pdf":
+        page_texts = []
+        for page_number, total_pages, page_text in iter_pdf_page_texts(file_obj):
+            page_texts.append(page_text)
+            progress["done"], progress["total"] = page_number, total_pages
+        return "\n".join(page_texts)
+
+    progress["total"] = 2
+    image_bytes = downscale_report_image(file_obj)
+    progress["done"] = 1
+    text = gemini_extract_report_image_text(image_bytes)
+    progress["done"] = 2
+    return text
+
+def extract_and_cache_report_text(file_obj, file_type, file_hash, progress, cache):
+    """Worker: runs off the Streamlit thread (no script context), so the caller passes in the
+    cache and progress dicts; it stores its own result - a rerun that abandons the polling loop
+    doesn't lose the work."""
+    try:
+        report_text = extract_report_text(file_obj, file_type, progress)
+    except Exception:
+        with cache["lock"]:
+            cache["items"].pop(file_hash, None)
+        raise
+    with cache["lock"]:
+        if report_text.strip():
+            cache["items"][file_hash] = report_text
+            cache["items"].move_to_end(file_hash)
+            while len(cache["items"]) > REPORT_CACHE_SIZE:
+                cache["items"].popitem(last=False)
+        else:
+            # Don't cache empty results - a later upload should get another try
+            cache["items"].pop(file_hash, None)
+    return report_text
+
+def extract_report_text_with_progress(uploaded_file):
+    """Cached by file hash; otherwise extracts in the background worker while showing progress.
+    An extraction already in flight for the same file (any session) is reused, not restarted."""
+    file_hash = hash_uploaded_file(uploaded_file)
+    cache = get_report_text_cache()
+    with cache["lock"]:
+        entry = cache["items"].get(file_hash)
+        if isinstance(entry, str):
+            cache["items"].move_to_end(file_hash)
+            return entry
+        if entry is None:
+            progress = {"done": 0, "total": 0}
+            future = get_report_executor().submit(extract_and_cache_report_text, uploaded_file, uploaded_file.type, file_hash, progress, cache)
+            entry = cache["items"][file_hash] = (future, progress)
+    future, progress = entry
+
+    progress_bar = st.progress(0.0, text="📄 रिपोर्ट पढ़ी जा रही है...")
+    while not future.done():
+        if progress["total"]:
+            progress_bar.progress(progress["done"] / progress["total"], text=f"📄 रिपोर्ट पढ़ी जा रही है... ({progress['done']}/{progress['total']})")
+        time.sleep(0.1)
+    progress_bar.empty()
+    return future.result()
+
+def clean_report_line(line):
+    # Same cleanup as advanced_semantic_diagnose: lowercase, letters only, single spaces
+    return " " + re.sub(r'\s+', ' ', re.sub(r'[^a-zA-Z\u0900-\u097F\s]', ' ', line.lower())).strip() + " "
+
+def line_has_term(cleaned_line, term):
+    # Whole words only ("dard" must not match "standard"); cleaned_line is space-padded
+    return f" {term} " in cleaned_line
+
+def extract_report_findings(report_text):
+    """Returns (standard symptoms, finding lines) for the report.
+    Symptoms come from whole-word LOCAL_TO_STANDARD_MAP hits on lines without a negative/normal
+    marker; finding lines also include lines flagged abnormal (HIGH/LOW/positive...).
+    Only these - not the raw report - go into advanced_semantic_diagnose and the Gemini prompt."""
+    standard_symptoms = set(LOCAL_TO_STANDARD_MAP.values())
+    found_symptoms, finding_lines = [], []
+    for line in report_text.splitlines():
+        cleaned = clean_report_line(line)
+        if any(line_has_term(cleaned, marker) for marker in REPORT_NEGATIVE_MARKERS):
+            continue
+        hits = [standard for local, standard in LOCAL_TO_STANDARD_MAP.items() if line_has_term(cleaned, local)]
+        hits += [standard for standard in standard_symptoms if line_has_term(cleaned, standard)]
+        flagged = any(line_has_term(cleaned, marker) for marker in REPORT_ABNORMAL_MARKERS)
+        if not hits and not flagged:
+            continue
+        found_symptoms.extend(symptom for symptom in hits if symptom not in found_symptoms)
+        if len(finding_lines) < REPORT_MAX_FINDING_LINES:
+            finding_lines.append(line.strip()[:REPORT_MAX_FINDING_LINE_CHARS])
+    return found_symptoms, finding_lines
+
 # Health Score Calculation (Retained)
 def calculate_health_score(temp, pain):
     score = 100
@@ -526,31 +844,62 @@ with st.form("diagnosis_form", clear_on_submit=False):
         placeholder="मुझे 3 दिन से बुखार सा लग रहा है, बदन दुख रहा है और बहुत कमजोरी महसूस हो रही है।",
         key="text_input_key"
     )
+    report_file = st.file_uploader(
+        "📄 लैब रिपोर्ट अपलोड करें (PDF / Image) - वैकल्पिक",
+        type=["pdf", "png", "jpg", "jpeg"],
+        key="report_file",
+        help=f"PDF के पहले {REPORT_MAX_PAGES} पेज पढ़े जाते हैं।"
+    )
     submitted = st.form_submit_button("⚡️ Diagnose / निदान करें", type="primary")
 
 st.markdown("---")
 
 # ---- 4. HYBRID PREDICTION & OUTPUT ----
 
+def show_emergency_alert():
+    st.markdown('<div class="emergency">🚨 EMERGENCY ALERT! तुरंत 108 बुलाएं या नजदीकी अस्पताल जाएं! 🚨</div>', unsafe_allow_html=True)
+    st.markdown("<h2 style='text-align:center;'><a href='tel:108' style='color:#00ff88;'>📞 108 डायल करें</a></h2>", unsafe_allow_html=True)
+    st.stop()
+
 if submitted or (st.session_state.get('ui_symptoms') and not input_text.strip()):
 
     # Emergency check (Retained)
     if any(k in input_text.lower() for k in ["सीने में दर्द", "chest pain", "सांस नहीं", "heart attack", "108", "बेहोश", "दम घुट रहा है"]):
-        st.markdown('<div class="emergency">🚨 EMERGENCY ALERT! तुरंत 108 बुलाएं या नजदीकी अस्पताल जाएं! 🚨</div>', unsafe_allow_html=True)
-        st.markdown("<h2 style='text-align:center;'><a href='tel:108' style='color:#00ff88;'>📞 108 डायल करें</a></h2>", unsafe_allow_html=True)
-        st.stop()
+        show_emergency_alert()
 
     # 💥 AI THINKING ANIMATION 💥
     with st.spinner('🧠 MediMind AI Diagnosis Engine सोच रहा है... (Applying Semantic NLP & Fuzzy Logic)'):
         time.sleep(1.5)
 
+    # Extract text from the uploaded lab report (if any); only its matched findings join the typed text
+    report_text, report_symptoms, report_findings = "", [], []
+    if report_file is not None:
+        try:
+            report_text = extract_report_text_with_progress(report_file)
+            if not report_text.strip():
+                st.warning("⚠️ अपलोड की गई रिपोर्ट में पढ़ने योग्य टेक्स्ट नहीं मिला।")
+        except Exception as e:
+            st.error(f"⚠️ रिपोर्ट से टेक्स्ट नहीं निकाला जा सका: {e}")
+        report_symptoms, report_findings = extract_report_findings(report_text)
+        if report_text.strip() and not report_symptoms:
+            st.info("ℹ️ रिपोर्ट में कोई पहचाना गया लक्षण नहीं मिला।")
+
+    # Emergency check for findings from the uploaded report (typed text is checked above)
+    if REPORT_EMERGENCY_SYMPTOMS.intersection(report_symptoms):
+        show_emergency_alert()
+
     # Run Local Diagnosis
-    results, processed_text, present_symptoms = advanced_semantic_diagnose(input_text, st.session_state.get('ui_symptoms', []))
+    results, processed_text, present_symptoms = advanced_semantic_diagnose(input_text + " " + " ".join(report_symptoms), st.session_state.get('ui_symptoms', []))
 
     # Run Gemini Phase 1: Diagnosis and Validation
     if GEMINI_ENABLED:
-        with st.spinner('🌐 Google Gemini AI से रियल-टाइम वैलिडेशन प्राप्त कर रहा है...'):
-            gemini_advice = gemini_search_and_diagnose(processed_text)
+        gemini_spinner_text = '🤖 Google Gemini AI से स्ट्रक्चर्ड विश्लेषण प्राप्त कर रहा है...' if GEMINI_STRUCTURED_MODE else '🌐 Google Gemini AI से रियल-टाइम वैलिडेशन प्राप्त कर रहा है...'
+        with st.spinner(gemini_spinner_text):
+            if GEMINI_STRUCTURED_MODE:
+                # Single call: diagnosis, severity, advice and preventive tip as typed JSON
+                gemini_advice = gemini_structured_diagnose(current_score, processed_text)
+            else:
+                gemini_advice = gemini_search_and_diagnose(processed_text)
             time.sleep(1)
     else:
         gemini_advice = "Gemini Validation: API Key कॉन्फ़िगर नहीं है।"
@@ -563,7 +912,7 @@ if submitted or (st.session_state.get('ui_symptoms') and not input_text.strip())
         # Store top disease for diet plan tool
         st.session_state['last_diagnosed_disease'] = top['disease']
         
-        emoji_map = {"Mild":"✅", "Moderate":"⚠️", "High":"🛑", "Critical":"🚨"}
+        emoji_map = SEVERITY_EMOJI_MAP
 
         col1, col2, col3 = st.columns([3, 2, 2])
 
@@ -614,9 +963,20 @@ if submitted or (st.session_state.get('ui_symptoms') and not input_text.strip())
     st.markdown("---")
 
     # --- Display Gemini Phase 1: Validation ---
-    st.markdown("<p style='color:#00ff88; font-size: 1.5rem; font-weight: bold;'>🌐 Google Gemini AI (Real-time Validation)</p>", unsafe_allow_html=True)
-
-    if gemini_advice and isinstance(gemini_advice, str) and 'Gemini API कॉल में त्रुटि' not in gemini_advice:
+    # Structured (JSON) mode cannot use the google_search tool, so don't label it as search-backed
+    gemini_section_label = "🤖 Google Gemini AI (Structured Analysis - बिना Google Search)" if GEMINI_STRUCTURED_MODE else "🌐 Google Gemini AI (Real-time Validation)"
+    gemini_failure_text = "⚠️ Gemini AI से स्ट्रक्चर्ड विश्लेषण प्राप्त नहीं हो सका।" if GEMINI_STRUCTURED_MODE else "⚠️ Gemini AI से रियल-टाइम सलाह प्राप्त नहीं हो सकी।"
+    st.markdown(f"<p style='color:#00ff88; font-size: 1.5rem; font-weight: bold;'>{gemini_section_label}</p>", unsafe_allow_html=True)
+
+    if isinstance(gemini_advice, dict):
+        st.markdown(f'<div data-testid="stMetric">**विश्वसनीयता**<p style="font-size: 1.8rem; color: #00ff88; font-weight: bold;">{gemini_advice["confidence"]}%</p></div>', unsafe_allow_html=True)
+        st.markdown(
+            f'<div class="stAlert">**रोग का नाम:** {SEVERITY_EMOJI_MAP.get(gemini_advice["severity"], "")} {gemini_advice["disease"]}'
+            f'\n\n**गंभीरता:** {gemini_advice["severity"]}'
+            f'\n\n**जेमिनी की सलाह:** {gemini_advice["advice"]}</div>',
+            unsafe_allow_html=True
+        )
+    elif gemini_advice and isinstance(gemini_advice, str) and 'Gemini API Call Error' not in gemini_advice and 'Gemini Validation' not in gemini_advice:
         formatted_advice = gemini_advice.replace(
             "रोग का नाम:", "**रोग का नाम:**"
         ).replace(
@@ -626,18 +986,27 @@ if submitted or (st.session_state.get('ui_symptoms') and not input_text.strip())
         )
         st.markdown(f'<div class="stAlert">{formatted_advice}</div>', unsafe_allow_html=True)
     elif gemini_advice and isinstance(gemini_advice, str):
-        st.error(f"⚠️ Gemini AI से रियल-टाइम सलाह प्राप्त नहीं हो सकी। कारण: {gemini_advice}")
+        st.error(f"{gemini_failure_text} कारण: {gemini_advice}")
     else:
-        st.warning("⚠️ Gemini AI से रियल-टाइम सलाह प्राप्त नहीं हो सकी।")
+        st.warning(gemini_failure_text)
 
     st.markdown("---")
 
     # --- Display Gemini Phase 2: Preventive Tip ---
     with st.spinner('✨ Gemini AI से व्यक्तिगत स्वास्थ्य टिप प्राप्त कर रहा है...'):
-        preventive_tip = gemini_get_preventive_tip(current_score, processed_text)
-        time.sleep(0.5)
+        preventive_tip = None
+        if isinstance(gemini_advice, dict):
+            # Already returned by the structured call - no second round trip
+            preventive_tip = gemini_advice["preventive_tip"]
+        elif not (GEMINI_STRUCTURED_MODE and GEMINI_ENABLED):
+            preventive_tip = gemini_get_preventive_tip(current_score, processed_text)
+            time.sleep(0.5)
         st.markdown("<p style='color:#ffc107; font-size: 1.5rem; font-weight: bold;'>🌟 आपका व्यक्तिगत निवारक स्वास्थ्य टिप</p>", unsafe_allow_html=True)
-        st.markdown(f'<div class="preventive-tip">**टिप:** {preventive_tip}</div>', unsafe_allow_html=True)
+        if preventive_tip is not None:
+            st.markdown(f'<div class="preventive-tip">**टिप:** {preventive_tip}</div>', unsafe_allow_html=True)
+        else:
+            # Structured call failed: same error state as the diagnosis panel, no canned tip
+            st.error(f"⚠️ Gemini AI से व्यक्तिगत टिप प्राप्त नहीं हो सकी। कारण: {gemini_advice}")
 
 
     # Final Warning/Debug Info
@@ -646,6 +1015,8 @@ if submitted or (st.session_state.get('ui_symptoms') and not input_text.strip())
         st.write(f"वर्तमान हेल्थ स्कोर: **{current_score}%**")
         st.write(f"वर्तमान BMI: **{bmi}** ({bmi_category})")
         st.write(f"पहचाने गए लक्षण: **{', '.join(present_symptoms)}**")
+        if report_findings:
+            st.text_area("रिपोर्ट के निष्कर्ष (Findings)", "\n".join(report_findings), height=150, disabled=True)
 
 else:
     st.info("⬆️ ऊपर लक्षण चुनें या अपनी भाषा में लिखें, फिर **'Diagnose / निदान करें'** बटन दबाएं। AI तुरंत डायग्नोसिस देगा!")
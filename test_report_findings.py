@@ -0,0 +1,26 @@
+import pytest
+
+# main.py is the Streamlit script itself; importing it needs the app's dependencies
+for module_name in ("streamlit", "google.genai", "fuzzywuzzy", "PIL", "PyPDF2"):
+    pytest.importorskip(module_name)
+
+import main
+
+
+def test_reference_and_method_lines_are_not_symptoms():
+    # "dard" (body ache) must not match inside "standard"
+    symptoms, _ = main.extract_report_findings("Ref: WHO standard 13-17\nStandardised photometry")
+    assert symptoms == []
+
+
+def test_negative_results_are_not_symptoms():
+    symptoms, _ = main.extract_report_findings(
+        "Widal test (Typhoid fever): Non-reactive\nPatient reports no chest pain"
+    )
+    assert symptoms == []
+
+
+def test_positive_findings_and_flagged_lab_values():
+    symptoms, findings = main.extract_report_findings("Complaints: fever and joint pain\nPlatelets 80000 LOW")
+    assert sorted(symptoms) == ["fever", "joint pain"]
+    assert findings == ["Complaints: fever and joint pain", "Platelets 80000 LOW"]